@@ -1,7 +1,13 @@
+import hashlib
+
 import streamlit as st
 import pandas as pd
 import numpy as np
 import plotly.express as px
+import plotly.graph_objects as go
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 
 st.set_page_config(
     page_title="F1 • Racing Dashboard",
@@ -54,48 +60,113 @@ div[data-testid="stMetric"]{
 """
 st.markdown(F1_CSS, unsafe_allow_html=True)
 
-def plotly_layout(fig, title=None):
-    fig.update_layout(
-        title=title,
-        paper_bgcolor="rgba(0,0,0,0)",
-        plot_bgcolor="rgba(0,0,0,0)",
-        font=dict(color="rgba(255,255,255,0.90)"),
-        margin=dict(l=10, r=10, t=55, b=10),
-        legend=dict(
-            bgcolor="rgba(255,255,255,0.03)",
-            bordercolor="rgba(255,255,255,0.10)",
-            borderwidth=1
-        )
+# Set on the figure layout itself: Streamlit's chart theme overrides template values
+F1_LAYOUT = dict(
+    paper_bgcolor="rgba(0,0,0,0)",
+    plot_bgcolor="rgba(0,0,0,0)",
+    font=dict(color="rgba(255,255,255,0.90)"),
+    margin=dict(l=10, r=10, t=55, b=10),
+    legend=dict(
+        bgcolor="rgba(255,255,255,0.03)",
+        bordercolor="rgba(255,255,255,0.10)",
+        borderwidth=1
     )
-    fig.update_xaxes(gridcolor="rgba(255,255,255,0.08)", zerolinecolor="rgba(255,255,255,0.08)")
-    fig.update_yaxes(gridcolor="rgba(255,255,255,0.08)", zerolinecolor="rgba(255,255,255,0.08)")
+)
+F1_AXIS = dict(gridcolor="rgba(255,255,255,0.08)", zerolinecolor="rgba(255,255,255,0.08)")
+
+def plotly_layout(fig, title=None):
+    fig.update_layout(**F1_LAYOUT, title=title)
+    # update_*axes also reaches facet axes (xaxis2, yaxis2, ...)
+    fig.update_xaxes(**F1_AXIS)
+    fig.update_yaxes(**F1_AXIS)
     return fig
 
+# "1,234.5" -> "1.234,5" in a single pass
+ES_SEPARATORS = str.maketrans(",.", ".,")
+
+def fig_key(name, *parts):
+    # blake2b over exactly what gets plotted: row hashes for frames, raw bytes for arrays
+    h = hashlib.blake2b(name.encode(), digest_size=16)
+    for p in parts:
+        if isinstance(p, (pd.DataFrame, pd.Series)):
+            p = pd.util.hash_pandas_object(p).to_numpy()
+        h.update(np.ascontiguousarray(p).tobytes())
+    return h.digest()
+
+def cached_fig(key, build, max_figs=64):
+    # Reuse the figure from an earlier rerun when its plotted data is unchanged
+    figs = st.session_state.setdefault("_figs", {})
+    if key not in figs:
+        if len(figs) >= max_figs:
+            figs.pop(next(iter(figs)))
+        figs[key] = build()
+    return figs[key]
+
 def nice_int(x):
     if pd.isna(x): return "—"
-    try: return f"{int(x):,}".replace(",", ".")
+    try: return f"{int(x):,}".translate(ES_SEPARATORS)
     except: return str(x)
 
 def nice_float(x, digits=2):
     if pd.isna(x): return "—"
     try:
-        return f"{float(x):,.{digits}f}".replace(",", "X").replace(".", ",").replace("X", ".")
+        return f"{float(x):,.{digits}f}".translate(ES_SEPARATORS)
     except:
         return str(x)
 
+# Columns the dashboard reads (DriverId duplicates Driver and is skipped) and their parsed types
+CSV_COLUMNS = [
+    "Position", "Pos.", "DriverNumber", "DriverNumber.1", "Driver", "Constructor", "Laps",
+    "Time/Retired", "Grid", "Points", "NPitstops", "MedianPitStopDuration", "Season", "RaceNumber",
+]
+CSV_TYPES = {
+    "Season": pa.int16(),
+    "RaceNumber": pa.int8(),
+    "Laps": pa.float32(),
+    "Points": pa.float32(),
+    "NPitstops": pa.float32(),
+    "MedianPitStopDuration": pa.float32(),
+}
+
+def csv_header(file):
+    # Header names as pandas would give them: repeated names become "X.1", "X.2", ...
+    names, seen = [], {}
+    for n in pacsv.open_csv(file).schema.names:
+        k = seen.get(n, 0)
+        seen[n] = k + 1
+        names.append(f"{n}.{k}" if k else n)
+    return names
+
+NUMBER_RE = r"^[-+]?(\d+\.?\d*|\.\d+)([eE][-+]?\d+)?$"
+
+def arrow_float32(arr):
+    # One Arrow cast; text that isn't a plain number (Ret, DSQ, PL, —) becomes null -> NaN
+    if pa.types.is_string(arr.type) or pa.types.is_large_string(arr.type):
+        arr = pc.utf8_trim_whitespace(arr)
+        arr = pc.if_else(pc.match_substring_regex(arr, NUMBER_RE), arr, pa.scalar(None, arr.type))
+    return pc.cast(arr, pa.float32()).to_numpy()
+
 @st.cache_data(show_spinner=False)
 def load_csv(file) -> pd.DataFrame:
-    df = pd.read_csv(file)
+    names = csv_header(file)
+    tbl = pacsv.read_csv(
+        file,
+        read_options=pacsv.ReadOptions(column_names=names, skip_rows=1),
+        convert_options=pacsv.ConvertOptions(
+            include_columns=[c for c in names if c in CSV_COLUMNS],
+            column_types={c: t for c, t in CSV_TYPES.items() if c in names},
+            strings_can_be_null=True,
+        ),
+    )
+    df = tbl.to_pandas()
 
     # Make column access robust
     pos_col = "Position" if "Position" in df.columns else ("Pos." if "Pos." in df.columns else None)
 
     # Resolve duplicated DriverNumber columns
     if "DriverNumber" in df.columns and "DriverNumber.1" in df.columns:
-        # Prefer the one with fewer nulls
-        a = df["DriverNumber"]
-        b = df["DriverNumber.1"]
-        df["DriverNumber_clean"] = np.where(a.notna(), a, b)
+        # First column, falling back to the second where it is null (one pass)
+        df["DriverNumber_clean"] = df["DriverNumber"].combine_first(df["DriverNumber.1"])
     elif "DriverNumber" in df.columns:
         df["DriverNumber_clean"] = df["DriverNumber"]
     elif "DriverNumber.1" in df.columns:
@@ -103,35 +174,173 @@ def load_csv(file) -> pd.DataFrame:
     else:
         df["DriverNumber_clean"] = np.nan
 
-    # Numeric conversions
+    # Numeric conversions (float32: positions fit easily, and it halves memory traffic)
     if pos_col:
-        df["Pos_num"] = pd.to_numeric(df[pos_col], errors="coerce")
+        df["Pos_num"] = arrow_float32(tbl[pos_col])
     else:
-        df["Pos_num"] = np.nan
-
-    df["Grid_num"] = pd.to_numeric(df.get("Grid"), errors="coerce")
-    df["Points"] = pd.to_numeric(df.get("Points"), errors="coerce").fillna(0)
+        df["Pos_num"] = np.float32(np.nan)
 
-    if "NPitstops" in df.columns:
-        df["NPitstops"] = pd.to_numeric(df["NPitstops"], errors="coerce")
-    if "MedianPitStopDuration" in df.columns:
-        df["MedianPitStopDuration"] = pd.to_numeric(df["MedianPitStopDuration"], errors="coerce")
+    df["Grid_num"] = arrow_float32(tbl["Grid"])
+    df["Points"] = df["Points"].fillna(0)
 
-    # DNF heuristic
+    # DNF heuristic + PosGain, written straight into preallocated outputs (no temporaries)
+    pos = df["Pos_num"].to_numpy()
+    is_dnf = np.isnan(pos)
     if "Time/Retired" in df.columns:
-        t = df["Time/Retired"].astype(str).str.lower()
-        df["IsDNF"] = df["Pos_num"].isna() | t.str.contains("ret|dnf|dsq|dns|dnc", regex=True)
-    else:
-        df["IsDNF"] = df["Pos_num"].isna()
+        t = pc.utf8_lower(tbl["Time/Retired"].cast(pa.string()))
+        is_dnf |= pc.match_substring_regex(t, "ret|dnf|dsq|dns|dnc").fill_null(False).to_numpy()
+    df["IsDNF"] = is_dnf
 
-    df["PosGain"] = df["Grid_num"] - df["Pos_num"]
+    pos_gain = np.empty(len(df), dtype=np.float32)
+    np.subtract(df["Grid_num"].to_numpy(), pos, out=pos_gain)
+    df["PosGain"] = pos_gain
 
+    # Categorical codes make groupby / isin / nunique integer operations
+    for c in ["Driver", "Constructor", "Season"]:
+        if c in df.columns:
+            df[c] = df[c].astype("category")
+
+    # Strip names on the few unique categories, not every row; names that collapse
+    # to the same text after stripping are merged and the categories stay sorted
     for c in ["Driver", "Constructor"]:
         if c in df.columns:
-            df[c] = df[c].astype(str).str.strip()
+            stripped = df[c].cat.categories.str.strip()
+            cats = stripped.unique().sort_values()
+            codes = df[c].cat.codes.to_numpy()
+            remap = cats.get_indexer(stripped)
+            df[c] = pd.Categorical.from_codes(np.where(codes >= 0, remap[codes], -1), categories=cats)
 
     return df
 
+@st.cache_data(show_spinner=False)
+def filter_options(file) -> dict:
+    # Sidebar choices only depend on the raw CSV; categories are already sorted
+    df = load_csv(file)
+    return dict(
+        seasons=df["Season"].cat.categories.tolist(),
+        races=sorted(df["RaceNumber"].dropna().unique().tolist()),
+        teams=df["Constructor"].cat.categories.tolist() if "Constructor" in df.columns else [],
+        drivers=df["Driver"].cat.categories.tolist() if "Driver" in df.columns else [],
+    )
+
+def isin_codes(col, values):
+    # Membership test on categorical codes: pure integer compare
+    wanted = pd.Categorical(values, categories=col.cat.categories).codes
+    return np.isin(col.cat.codes.values, wanted)
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def apply_filters(_df, file, seasons, races, teams, drivers, include_dnfs, only_points) -> pd.DataFrame:
+    # The frame is not hashed (leading underscore): the cache is keyed on the CSV it was
+    # loaded from plus the filters, which arrive as sorted tuples; () means "no filter"
+    df = _df
+    mask = np.ones(len(df), dtype=bool)
+    if seasons: mask &= isin_codes(df["Season"], seasons)
+    if races: mask &= np.isin(df["RaceNumber"].values, np.asarray(races))
+    if teams and "Constructor" in df.columns: mask &= isin_codes(df["Constructor"], teams)
+    if drivers and "Driver" in df.columns: mask &= isin_codes(df["Driver"], drivers)
+    if not include_dnfs: mask &= ~df["IsDNF"].values
+    if only_points: mask &= (df["Points"] > 0).values
+    return df[mask]
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def top_codes(codes, vals, n_cat, k, how="sum"):
+    # Per-category sum/mean over integer codes with np.bincount (no hash table),
+    # then argpartition for the k largest; NaN means rank last, unseen categories never.
+    # Cached on the (small) code/value arrays, so an unchanged selection is a lookup.
+    present = codes >= 0
+    seen = np.flatnonzero(np.bincount(codes[present], minlength=n_cat))
+    valid = present & ~np.isnan(vals)
+    agg = np.bincount(codes[valid], weights=vals[valid], minlength=n_cat)
+    if how == "mean":
+        with np.errstate(invalid="ignore", divide="ignore"):
+            agg = agg / np.bincount(codes[valid], minlength=n_cat)
+
+    k = min(k, seen.size)
+    if k == 0:
+        return np.empty(0, dtype=np.int64), np.empty(0)
+    rank = np.nan_to_num(agg[seen], nan=-np.inf)
+    part = np.argpartition(-rank, k - 1)[:k]
+    part = part[np.argsort(-rank[part], kind="stable")]
+    top = seen[part]
+    return top, agg[top]
+
+def top_by(d, by, value, k, how="sum") -> pd.DataFrame:
+    col = d[by]
+    cats = col.cat.categories
+    top, agg = top_codes(col.cat.codes.to_numpy(), d[value].to_numpy(), len(cats), k, how)
+    return pd.DataFrame({by: cats[top], value: agg})
+
+@st.cache_data(show_spinner=False, max_entries=32)
+def histogram_bins(values, nbins=30):
+    # Unit bins when the data spans fewer than nbins whole positions
+    lo, hi = values.min(), values.max()
+    bins = np.arange(lo - 0.5, hi + 1.5) if hi - lo < nbins else nbins
+    return np.histogram(values, bins=bins)
+
+def downsample_by(d, by, x, n_out=500) -> pd.DataFrame:
+    # Stratified subsample: within each category sort by x and keep the first row
+    # of each of n_out equal-size strata; small groups pass through untouched
+    codes = d[by].cat.codes.to_numpy(np.int64)
+    order = np.lexsort((d[x].to_numpy(), codes))
+    sorted_codes = codes[order]
+    starts = np.r_[0, np.flatnonzero(np.diff(sorted_codes)) + 1]
+    sizes = np.diff(np.r_[starts, codes.size])
+    size = sizes.repeat(sizes)
+    rank = np.arange(codes.size) - starts.repeat(sizes)
+    stratum = rank * n_out // size
+    first = np.r_[True, (stratum[1:] != stratum[:-1]) | (rank[1:] == 0)]
+    keep = np.zeros(codes.size, dtype=bool)
+    keep[order] = (size <= n_out) | first
+    return d[keep]
+
+def cumulative_standings(d, top_n=8) -> pd.DataFrame:
+    # Single lexsort over (Season, Driver, RaceKey); per-race sums via reduceat,
+    # per (Season, Driver) running total via one cumsum with segment offsets
+    seasons = d["Season"].cat.categories
+    drivers = d["Driver"].cat.categories
+    n_drv = len(drivers)
+
+    season = d["Season"].cat.codes.to_numpy(np.int64)
+    driver = d["Driver"].cat.codes.to_numpy(np.int64)
+    race = d["RaceNumber"]
+    keep = (season >= 0) & (driver >= 0) & race.notna().to_numpy()
+    race = race.to_numpy()
+    pts = d["Points"].to_numpy(np.float64)
+
+    # Top-N drivers by total points (drivers absent from the selection never qualify)
+    totals = np.bincount(driver[keep], weights=pts[keep], minlength=n_drv).astype(np.float64)
+    totals[np.bincount(driver[keep], minlength=n_drv) == 0] = -np.inf
+    k = min(top_n, int(np.isfinite(totals).sum()))
+    if k == 0:
+        return pd.DataFrame(columns=["Season", "RaceKey", "Driver", "Points", "CumPoints"])
+    top = np.argpartition(-totals, k - 1)[:k]
+    keep &= np.isin(driver, top)
+
+    key = season[keep] * n_drv + driver[keep]
+    race, pts = race[keep], pts[keep]
+    order = np.lexsort((race, key))
+    key, race, pts = key[order], race[order], pts[order]
+
+    race_starts = np.r_[0, np.flatnonzero((np.diff(key) != 0) | (np.diff(race) != 0)) + 1]
+    race_pts = np.add.reduceat(pts, race_starts)
+    key, race = key[race_starts], race[race_starts]
+
+    seg_start = np.r_[0, np.flatnonzero(np.diff(key) != 0) + 1]
+    seg_len = np.diff(np.r_[seg_start, key.size])
+    cs = np.cumsum(race_pts)
+    cs -= (cs[seg_start] - race_pts[seg_start]).repeat(seg_len)
+
+    # Row order (Season, RaceKey, Driver) so trace order matches a groupby
+    season, driver = key // n_drv, key % n_drv
+    out = np.lexsort((driver, race, season))
+    return pd.DataFrame({
+        "Season": pd.Categorical.from_codes(season[out], categories=seasons),
+        "RaceKey": race[out],
+        "Driver": pd.Categorical.from_codes(driver[out], categories=drivers),
+        "Points": race_pts[out],
+        "CumPoints": cs[out],
+    })
+
 # Header
 st.markdown(
     """
@@ -152,13 +361,14 @@ st.markdown(
 st.write("")
 
 CSV_PATH = "df_final.csv"
+TABLE_PAGE_ROWS = 500
+# Extra columns shown on scatter hover; plots get only these plus their x/y/color
+HOVER_COLS = ["Driver", "Season", "RaceNumber", "Points", "Time/Retired"]
 df = load_csv(CSV_PATH)
 
 # Filters
-seasons = sorted(df["Season"].dropna().unique().tolist())
-races = sorted(df["RaceNumber"].dropna().unique().tolist())
-teams = sorted(df["Constructor"].dropna().unique().tolist()) if "Constructor" in df.columns else []
-drivers = sorted(df["Driver"].dropna().unique().tolist()) if "Driver" in df.columns else []
+opts = filter_options(CSV_PATH)
+seasons, races, teams, drivers = opts["seasons"], opts["races"], opts["teams"], opts["drivers"]
 
 with st.sidebar:
     sel_seasons = st.multiselect("Temporada", seasons, default=[max(seasons)] if seasons else seasons)
@@ -168,13 +378,22 @@ with st.sidebar:
     include_dnfs = st.toggle("Incluir DNFs", value=True)
     only_points = st.toggle("Solo puntos > 0", value=False)
 
-dff = df.copy()
-if sel_seasons: dff = dff[dff["Season"].isin(sel_seasons)]
-if sel_races: dff = dff[dff["RaceNumber"].isin(sel_races)]
-if sel_teams and "Constructor" in dff.columns: dff = dff[dff["Constructor"].isin(sel_teams)]
-if sel_drivers and "Driver" in dff.columns: dff = dff[dff["Driver"].isin(sel_drivers)]
-if not include_dnfs: dff = dff[~dff["IsDNF"]]
-if only_points: dff = dff[dff["Points"] > 0]
+def _active(sel, options):
+    # Empty selection or "everything selected" both mean: no filter
+    if not sel or set(sel) == set(options):
+        return ()
+    return tuple(sorted(sel))
+
+dff = apply_filters(
+    df,
+    CSV_PATH,
+    _active(sel_seasons, seasons),
+    _active(sel_races, races),
+    _active(sel_teams, teams),
+    _active(sel_drivers, drivers),
+    include_dnfs,
+    only_points,
+)
 
 # KPIs
 c1, c2, c3, c4, c5 = st.columns(5)
@@ -191,44 +410,49 @@ with c4: st.metric("Puntos (suma)", nice_float(kpi_points, 0))
 with c5: st.metric("DNFs", nice_int(kpi_dnfs))
 
 st.write("")
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🏆 Standings", "🛠️ Pitstops", "🗂️ Tabla"])
-
-with tab1:
+# Each tab is a fragment: its own widgets only rerun that tab
+@st.fragment
+def render_overview(dff):
     colA, colB = st.columns([1.05, 0.95])
 
     with colA:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("#### 🔥 Ranking por puntos (Top 20)")
-        by_driver = (
-            dff.groupby("Driver", as_index=False)["Points"]
-            .sum()
-            .sort_values("Points", ascending=False)
-            .head(20)
-        )
-        fig = px.bar(by_driver, x="Points", y="Driver", orientation="h")
-        fig = plotly_layout(fig, "Top 20 • Puntos")
-        fig.update_traces(marker_line_width=0)
-        st.plotly_chart(fig, use_container_width=True)
+        by_driver = top_by(dff, "Driver", "Points", 20)
+
+        def build():
+            fig = px.bar(by_driver, x="Points", y="Driver", orientation="h")
+            fig = plotly_layout(fig, "Top 20 • Puntos")
+            fig.update_traces(marker_line_width=0)
+            return fig
+
+        st.plotly_chart(cached_fig(fig_key("top_drivers", by_driver), build), use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
     with colB:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("#### 🧠 Grid vs Finish (racecraft)")
-        scat = dff.dropna(subset=["Grid_num", "Pos_num"]).copy()
+        scat = dff.loc[:, ["Grid_num", "Pos_num", "Constructor", *HOVER_COLS]].dropna(subset=["Grid_num", "Pos_num"])
         if len(scat) == 0:
             st.info("No hay suficientes datos numéricos de Grid/Position con los filtros actuales.")
         else:
-            fig = px.scatter(
-                scat,
-                x="Grid_num",
-                y="Pos_num",
-                color="Constructor",
-                hover_data=["Driver", "Season", "RaceNumber", "Points", "Time/Retired"],
-                opacity=0.85,
-            )
-            fig = plotly_layout(fig, "Grid (x) vs Posición final (y) • Menor es mejor")
-            fig.update_yaxes(autorange="reversed")
-            st.plotly_chart(fig, use_container_width=True)
+            scat = downsample_by(scat, "Constructor", "Grid_num")
+
+            def build():
+                fig = px.scatter(
+                    scat,
+                    x="Grid_num",
+                    y="Pos_num",
+                    color="Constructor",
+                    hover_data=HOVER_COLS,
+                    opacity=0.85,
+                )
+                fig = plotly_layout(fig, "Grid (x) vs Posición final (y) • Menor es mejor")
+                fig.update_yaxes(autorange="reversed")
+                return fig
+
+            # Rows of the cached frame are fixed, so the index identifies the plotted subset
+            st.plotly_chart(cached_fig(fig_key("grid_vs_finish", scat.index.to_numpy()), build), use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
     st.write("")
@@ -237,53 +461,52 @@ with tab1:
     with colC:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("#### 📈 Ganancia de posiciones (Grid − Finish)")
-        tmp = dff.dropna(subset=["PosGain"])
-        if len(tmp) == 0:
+        gain = dff["PosGain"].dropna().to_numpy(dtype=np.float32)
+        if len(gain) == 0:
             st.info("Sin datos suficientes para PosGain.")
         else:
-            fig = px.histogram(tmp, x="PosGain", nbins=30)
-            fig = plotly_layout(fig, "Distribución de PosGain")
-            st.plotly_chart(fig, use_container_width=True)
+            # Bin server-side: ship ~30 counts instead of every row
+            counts, edges = histogram_bins(gain)
+
+            def build():
+                fig = go.Figure(go.Bar(x=0.5 * (edges[1:] + edges[:-1]), y=counts, width=edges[1] - edges[0]))
+                fig.update_layout(xaxis_title="PosGain", yaxis_title="count")
+                return plotly_layout(fig, "Distribución de PosGain")
+
+            st.plotly_chart(cached_fig(fig_key("posgain", counts, edges), build), use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
     with colD:
         st.markdown('<div class="card">', unsafe_allow_html=True)
         st.markdown("#### 🧱 Puntos por equipo")
-        by_team = (
-            dff.groupby("Constructor", as_index=False)["Points"]
-            .sum()
-            .sort_values("Points", ascending=False)
-            .head(12)
-        )
-        fig = px.bar(by_team, x="Constructor", y="Points")
-        fig = plotly_layout(fig, "Top 12 • Puntos por equipo")
-        st.plotly_chart(fig, use_container_width=True)
+        by_team = top_by(dff, "Constructor", "Points", 12)
+
+        def build():
+            fig = px.bar(by_team, x="Constructor", y="Points")
+            return plotly_layout(fig, "Top 12 • Puntos por equipo")
+
+        st.plotly_chart(cached_fig(fig_key("top_teams", by_team), build), use_container_width=True)
         st.markdown("</div>", unsafe_allow_html=True)
 
-with tab2:
+@st.fragment
+def render_standings(dff):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("#### 🏆 Standings acumulados por temporada")
 
-    d = dff.copy()
-    d["RaceKey"] = pd.to_numeric(d["RaceNumber"], errors="coerce")
+    top_n = st.slider("Pilotos en el gráfico", min_value=3, max_value=20, value=8)
+    dp = cumulative_standings(dff, top_n=top_n)
 
-    driver_points = (
-        d.groupby(["Season", "RaceKey", "Driver"], as_index=False)["Points"].sum()
-        .sort_values(["Season", "RaceKey"])
-    )
-    driver_points["CumPoints"] = driver_points.groupby(["Season", "Driver"])["Points"].cumsum()
+    title = f"Acumulado de puntos • Top {top_n} (según filtros)"
 
-    top_drivers = (
-        driver_points.groupby("Driver")["Points"].sum().sort_values(ascending=False).head(8).index.tolist()
-    )
-    dp = driver_points[driver_points["Driver"].isin(top_drivers)]
+    def build():
+        fig = px.line(dp, x="RaceKey", y="CumPoints", color="Driver", facet_row="Season", markers=True)
+        return plotly_layout(fig, title)
 
-    fig = px.line(dp, x="RaceKey", y="CumPoints", color="Driver", facet_row="Season", markers=True)
-    fig = plotly_layout(fig, "Acumulado de puntos • Top 8 (según filtros)")
-    st.plotly_chart(fig, use_container_width=True)
+    st.plotly_chart(cached_fig(fig_key(title, dp), build), use_container_width=True)
     st.markdown("</div>", unsafe_allow_html=True)
 
-with tab3:
+@st.fragment
+def render_pitstops(dff):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("#### 🛠️ Pitstops • frecuencia y duración")
 
@@ -293,37 +516,67 @@ with tab3:
         col1, col2 = st.columns([0.95, 1.05])
 
         with col1:
-            tmp = dff.groupby("Driver", as_index=False)["NPitstops"].mean().sort_values("NPitstops", ascending=False).head(20)
-            fig = px.bar(tmp, x="NPitstops", y="Driver", orientation="h")
-            fig = plotly_layout(fig, "Top 20 • NPitstops (media)")
-            st.plotly_chart(fig, use_container_width=True)
+            tmp = top_by(dff, "Driver", "NPitstops", 20, how="mean")
+
+            def build():
+                fig = px.bar(tmp, x="NPitstops", y="Driver", orientation="h")
+                return plotly_layout(fig, "Top 20 • NPitstops (media)")
+
+            st.plotly_chart(cached_fig(fig_key("pitstops_mean", tmp), build), use_container_width=True)
 
         with col2:
-            tmp2 = dff.dropna(subset=["MedianPitStopDuration"])
+            tmp2 = dff.loc[:, ["Constructor", "MedianPitStopDuration"]].dropna(subset=["MedianPitStopDuration"])
             if len(tmp2) == 0:
                 st.info("No hay duraciones de pitstop con los filtros actuales.")
             else:
-                fig2 = px.box(tmp2, x="Constructor", y="MedianPitStopDuration", points="outliers")
-                fig2 = plotly_layout(fig2, "Distribución • MedianPitStopDuration por equipo")
-                st.plotly_chart(fig2, use_container_width=True)
+                def build2():
+                    fig2 = px.box(tmp2, x="Constructor", y="MedianPitStopDuration", points="outliers")
+                    return plotly_layout(fig2, "Distribución • MedianPitStopDuration por equipo")
+
+                st.plotly_chart(cached_fig(fig_key("pitstops_box", tmp2.index.to_numpy()), build2), use_container_width=True)
 
         st.markdown("<hr/>", unsafe_allow_html=True)
-        tmp3 = dff.dropna(subset=["NPitstops", "MedianPitStopDuration"])
-        fig3 = px.scatter(
-            tmp3,
-            x="NPitstops",
-            y="MedianPitStopDuration",
-            color="Constructor",
-            hover_data=["Driver", "Season", "RaceNumber", "Points", "Time/Retired"],
-            opacity=0.85,
+        tmp3 = dff.loc[:, ["NPitstops", "MedianPitStopDuration", "Constructor", *HOVER_COLS]].dropna(
+            subset=["NPitstops", "MedianPitStopDuration"]
         )
-        fig3 = plotly_layout(fig3, "NPitstops vs MedianPitStopDuration")
-        st.plotly_chart(fig3, use_container_width=True)
+
+        def build3():
+            fig3 = px.scatter(
+                tmp3,
+                x="NPitstops",
+                y="MedianPitStopDuration",
+                color="Constructor",
+                hover_data=HOVER_COLS,
+                opacity=0.85,
+            )
+            return plotly_layout(fig3, "NPitstops vs MedianPitStopDuration")
+
+        st.plotly_chart(cached_fig(fig_key("pitstops_scatter", tmp3.index.to_numpy()), build3), use_container_width=True)
 
     st.markdown("</div>", unsafe_allow_html=True)
 
-with tab4:
+@st.fragment
+def render_table(dff):
     st.markdown('<div class="card">', unsafe_allow_html=True)
     st.markdown("#### 🗂️ Tabla (filtrada)")
-    st.dataframe(dff, use_container_width=True, height=520)
+    # Only one page of rows goes over the websocket; paging reruns just this fragment
+    n_pages = max(1, -(-len(dff) // TABLE_PAGE_ROWS))
+    page = st.number_input("Página", min_value=1, max_value=n_pages, value=1, step=1)
+    start = (page - 1) * TABLE_PAGE_ROWS
+    st.caption(f"{nice_int(len(dff))} filas • página {page} de {n_pages}")
+    st.dataframe(dff.iloc[start:start + TABLE_PAGE_ROWS], use_container_width=True, height=520)
     st.markdown("</div>", unsafe_allow_html=True)
+
+tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "🏆 Standings", "🛠️ Pitstops", "🗂️ Tabla"])
+
+with tab1:
+    render_overview(dff)
+
+with tab2:
+    render_standings(dff)
+
+with tab3:
+    render_pitstops(dff)
+
+with tab4:
+    render_table(dff)